@@ -3,59 +3,81 @@ import numpy as np
 from pynput.mouse import Controller, Button
 from cvzone.HandTrackingModule import HandDetector
 
-# Initialize external webcam (change index if needed)
-cap = cv2.VideoCapture(1)  # Change to 0 if the external cam is not detected
-cap.set(3, 640)  # Camera resolution width
-cap.set(4, 480)  # Camera resolution height
+# Camera, detector and window settings (also used by station_runner.py)
+FRAME_WIDTH, FRAME_HEIGHT = 640, 480  # Camera resolution
+DETECTOR_ARGS = dict(detectionCon=0.8, maxHands=1)
+WINDOW_NAME = "Virtual Mouse"
 
-# Initialize Hand Detector
-detector = HandDetector(detectionCon=0.8, maxHands=1)
-
-# Mouse Controller
-mouse = Controller()
 screen_w, screen_h = 1920, 1080  # Adjust based on screen resolution
 
 # Smoothing factor
 smoothening = 4
-prevX, prevY = 0, 0
 
-while cap.isOpened():
-    success, img = cap.read()
-    if not success:
-        break
 
-    img = cv2.flip(img, 1)  # Mirror effect
+class MouseSession:
+    # Per-station cursor smoothing state
+    def __init__(self, detector):
+        self.detector = detector
+
+        # Mouse Controller
+        self.mouse = Controller()
+        self.prevX, self.prevY = 0, 0
+
+    def process(self, img):
+        # Takes a mirrored camera frame, returns (frame to show, detected hands)
+        # Detect hands and draw landmarks
+        hands, img = self.detector.findHands(img, draw=True)
+
+        if hands:
+            hand = hands[0]
+            lmList = hand["lmList"]
+
+            if lmList:
+                x1, y1 = lmList[8][:2]  # Index finger tip
+
+                # Map webcam coordinates to screen coordinates
+                x3 = np.interp(x1, (0, FRAME_WIDTH), (0, screen_w))
+                y3 = np.interp(y1, (0, FRAME_HEIGHT), (0, screen_h))
+
+                # Apply smoothing
+                currX = self.prevX + (x3 - self.prevX) / smoothening
+                currY = self.prevY + (y3 - self.prevY) / smoothening
+
+                self.mouse.position = (currX, currY)
+                self.prevX, self.prevY = currX, currY
+
+                # Click when thumb and index finger are close
+                length, _, _ = self.detector.findDistance(lmList[8][:2], lmList[4][:2], img)
+                if length < 40:
+                    self.mouse.click(Button.left, 1)
+
+        return img, hands
 
-    # Detect hands and draw landmarks
-    hands, img = detector.findHands(img, draw=True)
 
-    if hands:
-        hand = hands[0]
-        lmList = hand["lmList"]
+if __name__ == "__main__":
+    # Initialize external webcam (change index if needed)
+    cap = cv2.VideoCapture(1)  # Change to 0 if the external cam is not detected
+    cap.set(3, FRAME_WIDTH)
+    cap.set(4, FRAME_HEIGHT)
 
-        if lmList:
-            x1, y1 = lmList[8][:2]  # Index finger tip
+    # Initialize Hand Detector
+    detector = HandDetector(**DETECTOR_ARGS)
 
-            # Map webcam coordinates to screen coordinates
-            x3 = np.interp(x1, (0, 640), (0, screen_w))
-            y3 = np.interp(y1, (0, 480), (0, screen_h))
+    session = MouseSession(detector)
 
-            # Apply smoothing
-            currX = prevX + (x3 - prevX) / smoothening
-            currY = prevY + (y3 - prevY) / smoothening
+    while cap.isOpened():
+        success, img = cap.read()
+        if not success:
+            break
 
-            mouse.position = (currX, currY)
-            prevX, prevY = currX, currY
+        img = cv2.flip(img, 1)  # Mirror effect
 
-            # Click when thumb and index finger are close
-            length, _, _ = detector.findDistance(lmList[8][:2], lmList[4][:2], img)
-            if length < 40:
-                mouse.click(Button.left, 1)
+        img, _ = session.process(img)
 
-    cv2.imshow("Virtual Mouse", img)
+        cv2.imshow(WINDOW_NAME, img)
 
-    if cv2.waitKey(1) & 0xFF == ord('q'):
-        break
+        if cv2.waitKey(1) & 0xFF == ord('q'):
+            break
 
-cap.release()
-cv2.destroyAllWindows()
+    cap.release()
+    cv2.destroyAllWindows()
@@ -0,0 +1,245 @@
+import os
+import sys
+import time
+import signal
+import argparse
+import importlib
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import cv2
+import numpy as np
+from cvzone.HandTrackingModule import HandDetector
+
+# app name -> (module, session class)
+APPS = {
+    "draw": ("Draw", "DrawSession"),
+    "drums": ("Drums", "DrumsSession"),
+    "mouse": ("MouseTracker", "MouseSession"),
+}
+
+RING_SLOTS = 4       # Frames kept per station, the supervisor only shows the newest
+LANDMARKS = 21       # Landmarks per hand from mediapipe
+STAT_FIELDS = 4      # fps, latency_ms, frames, running
+STATS_INTERVAL = 2.0 # Seconds between stats lines
+
+
+def _aligned(size, align=64):
+    return (size + align - 1) // align * align
+
+
+class FrameRing:
+    # Single-writer ring of (frame, landmarks, timestamp) slots in one shared
+    # memory block. The worker writes a slot and then bumps the counter, the
+    # supervisor reads the newest slot without ever blocking the worker.
+    def __init__(self, frame_shape, max_hands, slots=RING_SLOTS, name=None):
+        self.frame_shape = tuple(frame_shape)
+        self.max_hands = max_hands
+        self.slots = slots
+
+        parts = [
+            ("counter", (1,), np.int64),
+            ("stamps", (slots,), np.float64),
+            ("hand_counts", (slots,), np.int32),
+            ("landmarks", (slots, max_hands, LANDMARKS, 3), np.int32),
+            ("frames", (slots,) + self.frame_shape, np.uint8),
+        ]
+        offsets, size = [], 0
+        for _, shape, dtype in parts:
+            offsets.append(size)
+            size += _aligned(int(np.prod(shape)) * np.dtype(dtype).itemsize)
+
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            # Workers share the supervisor's resource tracker, which unlinks
+            # the block if the supervisor dies without cleaning up
+            self.shm = shared_memory.SharedMemory(name=name)
+
+        for (field, shape, dtype), offset in zip(parts, offsets):
+            setattr(self, field, np.ndarray(shape, dtype=dtype, buffer=self.shm.buf, offset=offset))
+        if name is None:
+            self.counter[0] = 0
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def write(self, frame, hands, stamp):
+        slot = int(self.counter[0]) % self.slots
+        self.frames[slot] = frame
+        self.stamps[slot] = stamp
+
+        count = min(len(hands), self.max_hands)
+        for i in range(count):
+            self.landmarks[slot, i] = hands[i]["lmList"]
+        self.hand_counts[slot] = count
+
+        # Publish the slot only after it is fully written
+        self.counter[0] += 1
+
+    def read_latest(self, last_seen=0):
+        # Returns (seq, frame, landmarks, stamp) for the newest slot, or None
+        # if nothing was written since seq last_seen, without copying anything
+        while True:
+            written = int(self.counter[0])
+            if written == last_seen:
+                return None
+            slot = (written - 1) % self.slots
+            frame = self.frames[slot].copy()
+            landmarks = self.landmarks[slot, :self.hand_counts[slot]].copy()
+            stamp = float(self.stamps[slot])
+
+            # If the writer lapped us while copying, the slot may be torn
+            if int(self.counter[0]) - written < self.slots - 1:
+                return written, frame, landmarks, stamp
+
+    def close(self):
+        # Drop the numpy views before closing the mapping
+        for field in ("counter", "stamps", "hand_counts", "landmarks", "frames"):
+            setattr(self, field, None)
+        self.shm.close()
+
+    def unlink(self):
+        self.shm.unlink()
+
+
+def read_stats(stats, index):
+    # Per-session stats as a dict
+    fps, latency_ms, frames, running = stats[index * STAT_FIELDS:(index + 1) * STAT_FIELDS]
+    return {"fps": fps, "latency_ms": latency_ms, "frames": int(frames), "running": bool(running)}
+
+
+def session_kwargs(app, camera):
+    # Per-station session arguments, so stations don't share output folders
+    if app == "draw":
+        return {"save_dir": os.path.join("saved_equations", f"{app}_{camera}")}
+    return {}
+
+
+def run_station(index, app, camera, ring_name, stats, stop_event):
+    # Worker process: capture -> detect -> app logic -> shared memory ring
+    # Ctrl+C reaches the whole process group; only the supervisor handles
+    # it and stops the workers through stop_event
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    module_name, class_name = APPS[app]
+    module = importlib.import_module(module_name)
+    frame_shape = (module.FRAME_HEIGHT, module.FRAME_WIDTH, 3)
+    ring = FrameRing(frame_shape, module.DETECTOR_ARGS["maxHands"], name=ring_name)
+
+    cap = cv2.VideoCapture(camera)
+    cap.set(3, module.FRAME_WIDTH)
+    cap.set(4, module.FRAME_HEIGHT)
+
+    detector = HandDetector(**module.DETECTOR_ARGS)
+    session = getattr(module, class_name)(detector, **session_kwargs(app, camera))
+
+    row = index * STAT_FIELDS
+    stats[row + 3] = 1
+    last = time.perf_counter()
+    try:
+        while not stop_event.is_set():
+            success, img = cap.read()
+            if not success:
+                print(f"Station {index}: failed to get frame from camera {camera}")
+                break
+            start = time.perf_counter()
+
+            img = cv2.flip(img, 1)
+            if img.shape != frame_shape:
+                img = cv2.resize(img, (module.FRAME_WIDTH, module.FRAME_HEIGHT))
+
+            frame, hands = session.process(img)
+            ring.write(frame, hands or [], time.time())
+
+            # Smoothed fps and processing latency
+            now = time.perf_counter()
+            stats[row] = 0.9 * stats[row] + 0.1 / max(now - last, 1e-6)
+            stats[row + 1] = 0.9 * stats[row + 1] + 100 * (now - start)
+            stats[row + 2] += 1
+            last = now
+    finally:
+        stats[row + 3] = 0
+        cap.release()
+        ring.close()
+
+
+def parse_station(text):
+    # "drums:1" -> ("drums", 1)
+    app, _, camera = text.partition(":")
+    if app not in APPS or not camera.isdigit():
+        raise argparse.ArgumentTypeError(f"expected <{'|'.join(APPS)}>:<camera index>, got {text!r}")
+    return app, int(camera)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run several hand-tracking stations, one process per camera")
+    parser.add_argument("stations", nargs="+", type=parse_station, help="e.g. draw:0 drums:1 mouse:2")
+    parser.add_argument("--headless", action="store_true", help="don't open preview windows")
+    args = parser.parse_args()
+
+    # There is only one system cursor for mouse stations to drive
+    if sum(app == "mouse" for app, _ in args.stations) > 1:
+        parser.error("only one mouse station can run at a time, they would all move the same cursor")
+
+    # Import the app modules (and with them cv2, cvzone and mediapipe) once,
+    # before the workers are started. Each worker still builds its own
+    # HandDetector, as a mediapipe graph can't be shared between processes.
+    modules = {app: importlib.import_module(APPS[app][0]) for app, _ in args.stations}
+
+    # fork shares the imported modules copy-on-write; other platforms fall back to spawn
+    ctx = mp.get_context("fork" if "fork" in mp.get_all_start_methods() else None)
+    stats = ctx.Array("d", len(args.stations) * STAT_FIELDS, lock=False)
+    stop_event = ctx.Event()
+
+    rings, workers = [], []
+    for index, (app, camera) in enumerate(args.stations):
+        module = modules[app]
+        ring = FrameRing((module.FRAME_HEIGHT, module.FRAME_WIDTH, 3), module.DETECTOR_ARGS["maxHands"])
+        rings.append(ring)
+        workers.append(ctx.Process(target=run_station, name=f"{app}:{camera}", daemon=True,
+                                   args=(index, app, camera, ring.name, stats, stop_event)))
+
+    for worker in workers:
+        worker.start()
+
+    last_report = time.time()
+    shown = [0] * len(rings)  # Last frame seq shown per station
+    try:
+        while any(worker.is_alive() for worker in workers):
+            if args.headless:
+                time.sleep(0.05)
+            else:
+                for index, (ring, worker, (app, _)) in enumerate(zip(rings, workers, args.stations)):
+                    latest = ring.read_latest(shown[index])
+                    if latest is not None:
+                        shown[index] = latest[0]
+                        cv2.imshow(f"{modules[app].WINDOW_NAME} [{worker.name}]", latest[1])
+                if cv2.waitKey(1) & 0xFF == ord('q'):
+                    break
+
+            if time.time() - last_report >= STATS_INTERVAL:
+                last_report = time.time()
+                parts = []
+                for index, worker in enumerate(workers):
+                    s = read_stats(stats, index)
+                    state = "" if s["running"] else " (stopped)"
+                    parts.append(f"{worker.name} {s['fps']:.1f} fps {s['latency_ms']:.1f} ms{state}")
+                print(" | ".join(parts))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_event.set()
+        for worker in workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+        for ring in rings:
+            ring.close()
+            ring.unlink()
+        if not args.headless:
+            cv2.destroyAllWindows()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
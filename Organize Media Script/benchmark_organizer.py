@@ -0,0 +1,424 @@
+import os
+import io
+import sys
+import json
+import time
+import queue
+import random
+import shutil
+import signal
+import struct
+import argparse
+import builtins
+import tempfile
+import subprocess
+from collections import Counter
+from datetime import datetime
+from PIL import Image
+
+import organize_files
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+
+# Placeholder date stamped into the JPEG template, replaced per file
+EXIF_PLACEHOLDER = b"2000:01:01 00:00:00"
+EXIF_DATETIME_ORIGINAL = 0x9003
+EXIF_IFD = 0x8769
+
+# Size of the pure-Python loop used to gauge current machine speed
+CALIBRATION_LOOP = 200_000
+
+# Upper bound on runs per phase when repeating to reach --min-time
+MAX_RUNS = 200
+
+# Seconds between the QuickTime epoch (1904-01-01) and the Unix epoch
+QUICKTIME_EPOCH_OFFSET = 2082844800
+
+# Share of each kind of file in the synthetic tree
+FILE_MIX = [
+    ("jpeg_exif", 0.40),
+    ("jpeg_plain", 0.15),
+    ("mp4", 0.20),
+    ("mov", 0.10),
+    ("other", 0.15),
+]
+
+
+def build_jpeg(with_exif):
+    # Tiny 8x8 JPEG, optionally carrying EXIF DateTimeOriginal
+    image = Image.new("RGB", (8, 8), (120, 80, 40))
+    buffer = io.BytesIO()
+    if with_exif:
+        exif = Image.Exif()
+        exif.get_ifd(EXIF_IFD)[EXIF_DATETIME_ORIGINAL] = EXIF_PLACEHOLDER.decode()
+        image.save(buffer, "JPEG", exif=exif)
+    else:
+        image.save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+def _box(kind, payload):
+    return struct.pack(">I", 8 + len(payload)) + kind + payload
+
+
+def build_quicktime(date, brand):
+    # ftyp + moov/mvhd, which is all hachoir needs for creation_date
+    stamp = int(date.timestamp()) + QUICKTIME_EPOCH_OFFSET
+    mvhd = struct.pack(">B3xIIII", 0, stamp, stamp, 1000, 1000)
+    mvhd += struct.pack(">IH10x", 0x00010000, 0x0100)
+    mvhd += struct.pack(">9I", 0x00010000, 0, 0, 0, 0x00010000, 0, 0, 0, 0x40000000)
+    mvhd += bytes(24) + struct.pack(">I", 2)
+    ftyp = _box(b"ftyp", brand + struct.pack(">I", 0) + brand)
+    return ftyp + _box(b"moov", _box(b"mvhd", mvhd))
+
+
+def random_date(rng):
+    return datetime(rng.randint(2005, 2024), rng.randint(1, 12), rng.randint(1, 28),
+                    rng.randint(0, 23), rng.randint(0, 59), rng.randint(0, 59))
+
+
+def generate_corpus(root, count, seed=0, max_depth=6, sorted_share=0.05):
+    # Build a reproducible media tree under root and return how many
+    # files were placed outside already-sorted YYYY/Month folders.
+    rng = random.Random(seed)
+    jpeg_exif = build_jpeg(True)
+    jpeg_plain = build_jpeg(False)
+    kinds = [kind for kind, _ in FILE_MIX]
+    weights = [share for _, share in FILE_MIX]
+
+    # Reusing a small pool of names gives plenty of collisions in the target folders
+    name_pool = max(1, count // 8)
+    made_dirs = set()
+    to_organize = 0
+
+    for i in range(count):
+        date = random_date(rng)
+        kind = rng.choices(kinds, weights)[0]
+
+        if rng.random() < sorted_share:
+            folder = os.path.join(root, str(date.year), organize_files.month_names[date.month])
+        else:
+            depth = rng.randint(0, max_depth)
+            folder = os.path.join(root, *(f"dir{rng.randint(0, 9)}" for _ in range(depth)))
+            to_organize += 1
+
+        if folder not in made_dirs:
+            os.makedirs(folder, exist_ok=True)
+            made_dirs.add(folder)
+
+        stem = f"IMG_{rng.randrange(name_pool):06d}"
+        if kind == "jpeg_exif":
+            name = stem + ".jpg"
+            data = jpeg_exif.replace(EXIF_PLACEHOLDER, date.strftime("%Y:%m:%d %H:%M:%S").encode())
+        elif kind == "jpeg_plain":
+            name = stem + ".jpeg"
+            data = jpeg_plain
+        elif kind == "mp4":
+            name = f"VID_{stem[4:]}.mp4"
+            data = build_quicktime(date, b"isom")
+        elif kind == "mov":
+            name = f"VID_{stem[4:]}.mov"
+            data = build_quicktime(date, b"qt  ")
+        else:
+            name = f"DOC_{stem[4:]}.txt"
+            data = b"synthetic"
+
+        # Same name in the same folder would overwrite, keep every file
+        path = os.path.join(folder, name)
+        if os.path.exists(path):
+            stem_name, ext = os.path.splitext(name)
+            path = os.path.join(folder, f"{stem_name}_{i}{ext}")
+        with open(path, "wb") as f:
+            f.write(data)
+
+    return to_organize
+
+
+class FsCallCounter:
+    # Counts filesystem calls made from Python through os/builtins while
+    # active. These are not kernel syscall counts: DirEntry.is_dir() and
+    # DirEntry.stat() run in C and are invisible here, even though stat()
+    # costs one lstat syscall per file on Linux. Use --strace for those.
+    TARGETS = [
+        (os, "stat"), (os, "lstat"), (os, "scandir"), (os, "listdir"),
+        (os, "mkdir"), (os, "rename"), (os, "replace"), (builtins, "open"),
+    ]
+
+    def __init__(self):
+        self.counts = Counter()
+        self._saved = []
+
+    def _wrap(self, name, func):
+        def counted(*args, **kwargs):
+            self.counts[name] += 1
+            return func(*args, **kwargs)
+        return counted
+
+    def __enter__(self):
+        for module, name in self.TARGETS:
+            func = getattr(module, name)
+            self._saved.append((module, name, func))
+            setattr(module, name, self._wrap(name, func))
+        return self
+
+    def __exit__(self, *exc):
+        for module, name, func in self._saved:
+            setattr(module, name, func)
+        self._saved.clear()
+
+
+def _tracer_pid():
+    with open("/proc/self/status", encoding="ascii") as f:
+        for line in f:
+            if line.startswith("TracerPid:"):
+                return int(line.split()[1])
+    return 0
+
+
+def parse_strace_summary(text):
+    # Turn the table printed by "strace -c" into {syscall: calls}
+    counts = {}
+    for line in text.splitlines():
+        fields = line.split()
+        if len(fields) < 5 or not fields[0][0].isdigit() or fields[-1] == "total":
+            continue
+        counts[fields[-1]] = int(fields[3])
+    return counts
+
+
+class StraceCounter:
+    # Kernel syscall counts for this process, taken by attaching "strace -c"
+    # while active. Needs strace on PATH and permission to ptrace ourselves.
+    def __init__(self):
+        self.counts = {}
+
+    def __enter__(self):
+        fd, self.out_path = tempfile.mkstemp(suffix=".strace")
+        os.close(fd)
+        self.proc = subprocess.Popen(
+            ["strace", "-c", "-f", "-q", "-p", str(os.getpid()), "-o", self.out_path],
+            stderr=subprocess.DEVNULL)
+
+        # Don't start the phase before strace is attached
+        deadline = time.time() + 10
+        while time.time() < deadline and self.proc.poll() is None:
+            if _tracer_pid():
+                break
+            time.sleep(0.01)
+        else:
+            self.proc.kill()
+            os.remove(self.out_path)
+            raise RuntimeError("strace could not attach, check that ptrace is allowed")
+        return self
+
+    def __exit__(self, *exc):
+        self.proc.send_signal(signal.SIGINT)
+        self.proc.wait(timeout=30)
+        with open(self.out_path, encoding="utf-8") as f:
+            self.counts = parse_strace_summary(f.read())
+        os.remove(self.out_path)
+
+
+def calibrate(runs=5):
+    # Time a fixed pure-Python loop. Phase rates are compared relative to
+    # it, so a baseline taken while the machine ran faster or slower (CPU
+    # frequency, other VMs on the host) still lines up.
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        sum(i * i for i in range(CALIBRATION_LOOP))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def timed_phase(name, func, repeats=1, setup=None, use_strace=False, min_time=0.0):
+    # Run func at least repeats times, and until min_time seconds were
+    # timed in total, then keep the fastest run so noise on short phases
+    # doesn't look like a regression. setup() runs untimed before each run
+    # and its result is passed to func. func returns the files it handled.
+    # With use_strace one more, untimed, run is made under strace.
+    calibration = calibrate()
+    best, total, runs = None, 0.0, 0
+    while runs < repeats or (total < min_time and runs < MAX_RUNS):
+        args = (setup(),) if setup else ()
+        with FsCallCounter() as counter:
+            start = time.perf_counter()
+            result = func(*args)
+            elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        total += elapsed
+        runs += 1
+
+    calibration = min(calibration, calibrate())
+
+    phase = {
+        "seconds": round(best, 4),
+        "calibration_s": round(calibration, 5),
+        "runs": runs,
+        "files": len(result),
+        "fs_calls": dict(counter.counts),
+    }
+    phase["files_per_s"] = round(phase["files"] / max(best, 1e-9), 1)
+    # Files handled per calibration loop, the machine-independent rate
+    phase["relative_rate"] = round(phase["files"] * calibration / max(best, 1e-9), 3)
+
+    line = (f"⏱️ {name:<8} {phase['files']:>9} files  {phase['seconds']:>9.3f}s  "
+            f"{phase['files_per_s']:>11.1f} files/s  python fs calls {sum(counter.counts.values())}")
+    if use_strace:
+        args = (setup(),) if setup else ()
+        with StraceCounter() as tracer:
+            result = func(*args)
+        phase["syscalls"] = tracer.counts
+        line += f"  syscalls {sum(tracer.counts.values())}"
+    print(line)
+    return phase, result
+
+
+def restore_moves(log_path):
+    # Put files moved by the last mover run back where they came from
+    if not os.path.exists(log_path):
+        return
+    with open(log_path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    for record in records:
+        if record.get("event") == "moved":
+            os.rename(record["dst"], record["src"])
+    os.remove(log_path)
+
+
+def run_benchmark(root, log_path, repeats=1, use_strace=False, min_time=0.0):
+    # Time walk, date extraction and move separately on the tree in root
+    phases = {}
+    skip = {os.path.basename(log_path)}
+
+    phases["walk"], items = timed_phase(
+        "walk", lambda: list(organize_files.scan_files(root, skip)), repeats,
+        use_strace=use_strace, min_time=min_time)
+
+    def extract():
+        return [(path, name, size, organize_files.get_original_date(path, ctime), None)
+                for path, name, size, ctime, _ in items]
+    phases["extract"], extracted = timed_phase("extract", extract, repeats,
+                                             use_strace=use_strace, min_time=min_time)
+
+    # Each move run starts from the original tree and is fed the
+    # extracted items straight from a queue
+    errors = []
+
+    def prepare_move():
+        restore_moves(log_path)
+        move_q = queue.Queue()
+        for item in extracted:
+            move_q.put(item)
+        move_q.put(organize_files._DONE)
+        return move_q
+
+    def move(move_q):
+        stats = organize_files.PipelineStats()
+        with open(log_path, "w", encoding="utf-8") as log_file:
+            organize_files.mover_stage(root, move_q, log_file, stats)
+        errors.append(stats.errors)
+        return extracted
+    phases["move"], _ = timed_phase("move", move, repeats, prepare_move, use_strace, min_time)
+    phases["move"]["errors"] = errors[-1]
+    return phases
+
+
+def compare(phases, baseline, tolerance):
+    # Return a list of regression messages, empty if none
+    problems = []
+    for name, phase in phases.items():
+        old = baseline["phases"].get(name)
+        if not old:
+            continue
+        # Only a drop in both the raw and the calibrated rate counts. Real
+        # slowdowns show up in both, machine noise rarely does.
+        keys = [key for key in ("files_per_s", "relative_rate") if key in old]
+        slower = all(phase[key] < old[key] * (1 - tolerance) for key in keys)
+        if slower:
+            problems.append(f"{name}: {phase['files_per_s']:.1f} files/s, baseline {old['files_per_s']:.1f}")
+        for call, count in phase["fs_calls"].items():
+            before = old["fs_calls"].get(call, 0)
+            if count > before:
+                problems.append(f"{name}: {count} {call} calls, baseline {before}")
+        # strace also sees a few calls of its own attach/detach, allow for that
+        for call, count in phase.get("syscalls", {}).items():
+            before = old.get("syscalls", {}).get(call)
+            if before is not None and count > before + max(10, before * 0.01):
+                problems.append(f"{name}: {count} {call} syscalls, baseline {before}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark organize_files.py on a synthetic media tree")
+    parser.add_argument("--files", type=int, default=10000, help="number of files to generate (up to 1000000)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the tree layout")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed files/s drop (0.2 = 20%%)")
+    parser.add_argument("--repeats", type=int, default=5, help="runs per phase, the fastest one counts")
+    parser.add_argument("--min-time", type=float, default=2.0,
+                        help="keep repeating a phase until this many seconds were timed")
+    parser.add_argument("--strace", action="store_true", help="also count kernel syscalls with strace (Linux)")
+    parser.add_argument("--keep", action="store_true", help="keep the generated tree")
+    args = parser.parse_args()
+
+    if not 1 <= args.files <= 1_000_000:
+        parser.error("--files must be between 1 and 1000000")
+    if args.repeats < 1:
+        parser.error("--repeats must be at least 1")
+    if args.strace and not shutil.which("strace"):
+        parser.error("--strace needs strace installed")
+
+    work_dir = tempfile.mkdtemp(prefix="organize_bench_")
+    root = os.path.join(work_dir, "media")
+    log_path = os.path.join(work_dir, organize_files.LOG_NAME)
+    try:
+        print(f"🛠️ Generating {args.files} files in {root}")
+        start = time.perf_counter()
+        expected = generate_corpus(root, args.files, args.seed)
+        print(f"   done in {time.perf_counter() - start:.1f}s")
+
+        phases = run_benchmark(root, log_path, args.repeats, args.strace, args.min_time)
+    finally:
+        if args.keep:
+            print(f"📁 Tree kept at {work_dir}")
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    # Files in sorted folders must be left alone, everything else must move
+    moved = phases["move"]["files"] - phases["move"]["errors"]
+    if phases["walk"]["files"] != expected or moved != expected:
+        print(f"❌ Expected {expected} files organized, walk saw {phases['walk']['files']}, moved {moved}")
+        return 1
+
+    result = {"files": args.files, "seed": args.seed, "repeats": args.repeats, "phases": phases}
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"💾 Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("⚠️ No baseline to compare against, run with --save-baseline first")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if (baseline["files"], baseline["seed"]) != (args.files, args.seed):
+        print(f"⚠️ Baseline was taken with --files {baseline['files']} --seed {baseline['seed']}, not comparing")
+        return 0
+
+    problems = compare(phases, baseline, args.tolerance)
+    for problem in problems:
+        print(f"❌ Regression in {problem}")
+    if problems:
+        return 1
+    print("✅ No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
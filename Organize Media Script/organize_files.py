@@ -1,6 +1,10 @@
 import os
 import shutil
 import sys
+import json
+import time
+import queue
+import threading
 from datetime import datetime
 from PIL import Image
 from PIL.ExifTags import TAGS
@@ -14,7 +18,16 @@ month_names = {
     9: "September", 10: "October", 11: "November", 12: "December"
 }
 
-def get_original_date(filepath):
+# Pipeline settings
+QUEUE_SIZE = 1024          # Max items waiting between two stages
+PROGRESS_INTERVAL = 0.5    # Seconds between progress line refreshes
+LOG_NAME = "organize_log.jsonl"
+
+# Marker put on a queue when the stage feeding it is finished
+_DONE = object()
+
+
+def get_original_date(filepath, ctime=None):
     ext = os.path.splitext(filepath)[1].lower()
 
     #  Try EXIF for JPEG images
@@ -43,65 +56,228 @@ def get_original_date(filepath):
         except Exception:
             pass
 
-    # Fallback to file system creation date
-    return datetime.fromtimestamp(os.path.getctime(filepath))
+    # Fallback to file system creation date (reuse the scanner's stat if we have it)
+    if ctime is None:
+        ctime = os.path.getctime(filepath)
+    return datetime.fromtimestamp(ctime)
 
-# Check if folder path is passed
-if len(sys.argv) < 2:
-    print("❌ Usage: python organize_files_exif_video.py <folder_path>")
-    input("Press Enter to exit...")
-    sys.exit(1)
 
-base_dir = sys.argv[1]
+def is_sorted_folder(rel_parts):
+    # Already sorted folders look like base_dir/2024/July
+    return len(rel_parts) == 2 and rel_parts[0].isdigit() and rel_parts[1] in month_names.values()
 
-if not os.path.exists(base_dir):
-    print(f"❌ Folder does not exist: {base_dir}")
-    input("Press Enter to exit...")
-    sys.exit(1)
 
-# Walk through all files
-for root, dirs, files in os.walk(base_dir):
-    # Skip already sorted folders like base_dir/2024/July
-    rel = os.path.relpath(root, base_dir)
-    parts = rel.split(os.sep)
-    if len(parts) == 2 and parts[0].isdigit() and parts[1] in month_names.values():
-        continue
+def scan_files(base_dir, skip_names=()):
+    # Yield (path, name, size, ctime, error) for every file below base_dir.
+    # A DirEntry keeps its stat result after the first call, so each file
+    # is stat'ed at most once for the whole pipeline. Entries that can't be
+    # read are yielded with an error message instead of size and ctime.
+    stack = [(base_dir, ())]
+    while stack:
+        folder, rel_parts = stack.pop()
+        try:
+            entries = os.scandir(folder)
+        except OSError as e:
+            yield folder, os.path.basename(folder), 0, None, str(e)
+            continue
 
-    for file in files:
-        file_path = os.path.join(root, file)
+        # Skip files already in sorted folders like base_dir/2024/July,
+        # but still look inside their subfolders
+        in_sorted_folder = is_sorted_folder(rel_parts)
+        with entries:
+            for entry in entries:
+                try:
+                    # Like os.walk: links to folders are neither entered nor
+                    # moved, everything else (file links too) is a file
+                    if entry.is_dir():
+                        if not entry.is_symlink():
+                            stack.append((entry.path, rel_parts + (entry.name,)))
+                        continue
+                    if in_sorted_folder or entry.name in skip_names:
+                        continue
+                    # Follows links, as the ctime fallback did before
+                    st = entry.stat()
+                except OSError as e:
+                    yield entry.path, entry.name, 0, None, str(e)
+                    continue
+                yield entry.path, entry.name, st.st_size, st.st_ctime, None
 
-        # Skip the script itself
-        if file == os.path.basename(__file__):
-            continue
 
-        try:
-            date = get_original_date(file_path)
-        except Exception as e:
-            print(f"❌ Error reading date for {file_path}: {e}")
-            continue
+class PipelineStats:
+    # Counters shared by all stages, read by the progress reporter
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.start = time.perf_counter()
+        self.scanned = 0
+        self.extracted = 0
+        self.moved = 0
+        self.errors = 0
+        self.bytes_moved = 0
+
+    def add(self, **counts):
+        with self.lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def snapshot(self):
+        with self.lock:
+            elapsed = max(time.perf_counter() - self.start, 1e-9)
+            return {
+                "elapsed": round(elapsed, 3),
+                "scanned": self.scanned,
+                "extracted": self.extracted,
+                "moved": self.moved,
+                "errors": self.errors,
+                "bytes_moved": self.bytes_moved,
+                "files_per_s": round(self.moved / elapsed, 1),
+                "bytes_per_s": round(self.bytes_moved / elapsed, 1),
+            }
+
+
+def _put_all(items, out_q):
+    # Always signal the next stage, even if producing items fails
+    try:
+        for item in items:
+            out_q.put(item)
+    finally:
+        out_q.put(_DONE)
+
+
+def scanner_stage(base_dir, skip_names, out_q, stats):
+    def counted():
+        for item in scan_files(base_dir, skip_names):
+            stats.add(scanned=1)
+            yield item
+    _put_all(counted(), out_q)
+
+
+def extractor_stage(in_q, out_q, stats):
+    # Turns (path, name, size, ctime, error) into (path, name, size, date, error)
+    try:
+        while True:
+            item = in_q.get()
+            if item is _DONE:
+                break
+            path, name, size, ctime, error = item
+            date = None
+            if not error:
+                try:
+                    date = get_original_date(path, ctime)
+                except Exception as e:
+                    error = str(e)
+            stats.add(extracted=1)
+            out_q.put((path, name, size, date, error))
+    finally:
+        out_q.put(_DONE)
+
+
+def unique_destination(folder, file):
+    # Avoid overwriting files
+    destination = os.path.join(folder, file)
+    counter = 1
+    while os.path.exists(destination):
+        name, ext = os.path.splitext(file)
+        new_name = f"{name}_{counter}{ext}"
+        destination = os.path.join(folder, new_name)
+        counter += 1
+    return destination
+
+
+def mover_stage(base_dir, in_q, log_file, stats):
+    # Only this stage writes to the log, so no locking is needed on it
+    created = set()
+    while True:
+        item = in_q.get()
+        if item is _DONE:
+            break
+        path, name, size, date, error = item
+        record = {"ts": time.time(), "src": path, "bytes": size}
+
+        if error or not date:
+            record.update(event="error", error=error or "could not determine date")
+            stats.add(errors=1)
+        else:
+            # Create folders like base_dir/2023/September
+            month_folder = os.path.join(base_dir, str(date.year), month_names[date.month])
+            if month_folder not in created:
+                os.makedirs(month_folder, exist_ok=True)
+                created.add(month_folder)
+
+            destination = unique_destination(month_folder, name)
+            try:
+                shutil.move(path, destination)
+                record.update(event="moved", dst=destination, date=date.strftime("%Y-%m-%d"))
+                stats.add(moved=1, bytes_moved=size)
+            except OSError as e:
+                record.update(event="error", error=str(e))
+                stats.add(errors=1)
+
+        log_file.write(json.dumps(record) + "\n")
+
+
+def progress_reporter(stats, queues, stop_event, out=sys.stdout):
+    while not stop_event.wait(PROGRESS_INTERVAL):
+        s = stats.snapshot()
+        depths = "/".join(str(q.qsize()) for q in queues)
+        out.write(f"\r⏳ {s['moved']} moved, {s['errors']} errors | "
+                  f"{s['files_per_s']:.0f} files/s, {s['bytes_per_s'] / 1e6:.1f} MB/s | "
+                  f"queues {depths}   ")
+        out.flush()
+
+
+def organize(base_dir, log_path=None, show_progress=True, skip_names=None):
+    # Run scanner -> extractor -> mover as threads linked by bounded queues.
+    # Returns the final stats snapshot.
+    if log_path is None:
+        log_path = os.path.join(base_dir, LOG_NAME)
+    if skip_names is None:
+        skip_names = {os.path.basename(__file__)}
+    skip_names = set(skip_names) | {os.path.basename(log_path)}
+
+    stats = PipelineStats()
+    scan_q = queue.Queue(maxsize=QUEUE_SIZE)
+    move_q = queue.Queue(maxsize=QUEUE_SIZE)
+    stop_event = threading.Event()
+
+    workers = [
+        threading.Thread(target=scanner_stage, args=(base_dir, skip_names, scan_q, stats), daemon=True),
+        threading.Thread(target=extractor_stage, args=(scan_q, move_q, stats), daemon=True),
+    ]
+    if show_progress:
+        workers.append(threading.Thread(target=progress_reporter,
+                                        args=(stats, (scan_q, move_q), stop_event), daemon=True))
+    for worker in workers:
+        worker.start()
+
+    with open(log_path, "a", encoding="utf-8") as log_file:
+        mover_stage(base_dir, move_q, log_file, stats)
+        summary = stats.snapshot()
+        log_file.write(json.dumps({"ts": time.time(), "event": "summary", **summary}) + "\n")
+
+    stop_event.set()
+    for worker in workers:
+        worker.join()
+    return summary
 
-        if not date:
-            print(f"⚠️ Could not determine date for: {file_path}")
-            continue
 
-        year = str(date.year)
-        month = month_names[date.month]
+if __name__ == "__main__":
+    # Check if folder path is passed
+    if len(sys.argv) < 2:
+        print("❌ Usage: python organize_files.py <folder_path> [log_file]")
+        input("Press Enter to exit...")
+        sys.exit(1)
 
-        # Create folders like base_dir/2023/September
-        year_folder = os.path.join(base_dir, year)
-        month_folder = os.path.join(year_folder, month)
-        os.makedirs(month_folder, exist_ok=True)
+    base_dir = sys.argv[1]
+    log_path = sys.argv[2] if len(sys.argv) > 2 else None
 
-        # Avoid overwriting files
-        destination = os.path.join(month_folder, file)
-        counter = 1
-        while os.path.exists(destination):
-            name, ext = os.path.splitext(file)
-            new_name = f"{name}_{counter}{ext}"
-            destination = os.path.join(month_folder, new_name)
-            counter += 1
+    if not os.path.exists(base_dir):
+        print(f"❌ Folder does not exist: {base_dir}")
+        input("Press Enter to exit...")
+        sys.exit(1)
 
-        shutil.move(file_path, destination)
-        print(f"✅ Moved: {file_path} → {destination}")
+    summary = organize(base_dir, log_path)
+    print(f"\n📊 {summary['moved']} moved, {summary['errors']} errors in {summary['elapsed']:.1f}s "
+          f"({summary['files_per_s']:.0f} files/s)")
+    print(f"📝 Log written to {log_path or os.path.join(base_dir, LOG_NAME)}")
 
-input("\n✅ Done organizing. Press Enter to close...")
+    input("\n✅ Done organizing. Press Enter to close...")